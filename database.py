@@ -43,13 +43,31 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     result = db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+def create_documents(collection_name: str, docs: list):
+    """Insert multiple documents with timestamps in one round-trip"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-    
-    cursor = db[collection_name].find(filter_dict or {})
+
+    now = datetime.now(timezone.utc)
+    payload = []
+    for doc in docs:
+        data_dict = doc.model_dump() if isinstance(doc, BaseModel) else doc.copy()
+        data_dict['created_at'] = now
+        data_dict['updated_at'] = now
+        payload.append(data_dict)
+
+    result = db[collection_name].insert_many(payload)
+    return [str(oid) for oid in result.inserted_ids]
+
+def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, sort: list = None, projection: dict = None):
+    """Get documents from collection, optionally sorted, limited and projected server-side"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    cursor = db[collection_name].find(filter_dict or {}, projection)
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
-    
+
     return list(cursor)
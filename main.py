@@ -1,15 +1,24 @@
 import os
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
 
-from fastapi import FastAPI, HTTPException
+import msgspec
+import numpy as np
+import orjson
+from numba import njit
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-from database import db, create_document, get_documents
+from database import db, create_document, create_documents, get_documents
 from schemas import Train, Section, Incident, Scenario, Schedule, ScheduleLeg, AuditEvent, KPIReport
 
-app = FastAPI(title="Rail Decision Support API", version="0.2.0")
+app = FastAPI(title="Rail Decision Support API", version="0.2.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,79 +42,435 @@ class OptimizeResponse(BaseModel):
     schedule: Schedule
     explanation: str
 
+
+# msgspec mirrors of the response models: encoding a Struct tree skips both
+# model_dump and the generic dict encoder, serializing straight to bytes
+class _ScheduleLegMsg(msgspec.Struct):
+    train_id: str
+    section_id: str
+    enter_time: datetime
+    exit_time: datetime
+    meet_pass_at: Optional[str] = None
+
+class _ScheduleMsg(msgspec.Struct):
+    scenario_id: Optional[str]
+    legs: List[_ScheduleLegMsg]
+    objective: Dict
+    created_at: datetime
+
+class _OptimizeResponseMsg(msgspec.Struct):
+    schedule: _ScheduleMsg
+    explanation: str
+
+_SCHEDULE_ENCODER = msgspec.json.Encoder()
+
+
+def _encode_optimize_response(sched: Schedule, explanation: str) -> bytes:
+    msg = _OptimizeResponseMsg(
+        schedule=_ScheduleMsg(
+            scenario_id=sched.scenario_id,
+            legs=[
+                _ScheduleLegMsg(l.train_id, l.section_id, l.enter_time, l.exit_time, l.meet_pass_at)
+                for l in sched.legs
+            ],
+            objective=sched.objective,
+            created_at=sched.created_at,
+        ),
+        explanation=explanation,
+    )
+    return _SCHEDULE_ENCODER.encode(msg)
+
 SAFE_HEADWAY_MIN = 5  # minutes separation buffer between trains entering same single-track section
 
+# Audit events are queued and flushed in batches off the request path instead
+# of paying a synchronous Mongo insert per request
+_AUDIT_QUEUE: "queue.Queue[AuditEvent]" = queue.Queue()
+_AUDIT_FLUSH_INTERVAL_SEC = 1.0
+_AUDIT_BATCH_MAX = 100
+_audit_worker_started = False
+_audit_worker_lock = threading.Lock()
+
+
+def _audit_worker() -> None:
+    while True:
+        batch = [_AUDIT_QUEUE.get()]
+        try:
+            deadline = time.monotonic() + _AUDIT_FLUSH_INTERVAL_SEC
+            while len(batch) < _AUDIT_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(_AUDIT_QUEUE.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            create_documents("auditevent", batch)
+        except Exception:
+            pass  # auditing is best-effort, same as before
+
+
+def log_audit_event(event: AuditEvent) -> None:
+    """Queue an audit event for batched background insertion."""
+    global _audit_worker_started
+    if db is None:
+        return
+    if not _audit_worker_started:
+        with _audit_worker_lock:
+            if not _audit_worker_started:
+                threading.Thread(target=_audit_worker, name="audit-writer", daemon=True).start()
+                _audit_worker_started = True
+    _AUDIT_QUEUE.put(event)
+
 
 def compute_run_time_minutes(section: Section, train: Train) -> int:
-    speed = min(section.max_speed_kmh, train.max_speed_kmh or section.max_speed_kmh)
+    if not train.max_speed_kmh:
+        # Freight and other uncapped stock (None or 0) run at the section
+        # limit; skip the min
+        speed = section.max_speed_kmh
+    else:
+        speed = min(section.max_speed_kmh, train.max_speed_kmh)
     hours = section.length_km / max(speed, 1)
     return max(1, int(hours * 60))
 
 
-def parse_fixed_overrides(overrides: Dict[str, Any]) -> Dict[str, datetime]:
-    fixed = {}
+# The JIT core works on int64 minutes since epoch: datetime arithmetic and
+# dict lookups are pure interpreter overhead in the hot loop
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _minutes_since_epoch(dt: datetime) -> int:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((dt - _EPOCH).total_seconds() // 60)
+
+
+def _minutes_to_datetime(minutes: int) -> datetime:
+    return _EPOCH + timedelta(minutes=int(minutes))
+
+
+@njit(cache=True)
+def _schedule_core(route_idx, route_len, section_len, section_spd, train_speed, train_capped, train_dep_min, fixed_enter):
+    """Roll every train over its route in integer-minute arithmetic.
+
+    Run times are computed in-loop from the structure-of-arrays section and
+    train data, fused with the rollout so no intermediate run-time matrix is
+    materialized. fixed_enter holds controller-fixed enter minutes, -1 where
+    unset. Returns (enter_min, exit_min) arrays shaped like route_idx.
+    """
+    n_trains, max_route = route_idx.shape
+    enter_min = np.zeros((n_trains, max_route), dtype=np.int64)
+    exit_min = np.zeros((n_trains, max_route), dtype=np.int64)
+    for ti in range(n_trains):
+        current = train_dep_min[ti]
+        capped = train_capped[ti]
+        for step in range(route_len[ti]):
+            si = route_idx[ti, step]
+            speed = section_spd[si]
+            # Uncapped trains (freight defaults) run at the section limit;
+            # only capped trains pay the speed comparison
+            if capped and train_speed[ti] < speed:
+                speed = train_speed[ti]
+            if speed < 1.0:
+                speed = 1.0
+            run = int(section_len[si] / speed * 60.0)
+            if run < 1:
+                run = 1
+            enter = fixed_enter[ti, step]
+            if enter < 0:
+                enter = current
+            exit_ = enter + run
+            enter_min[ti, step] = enter
+            exit_min[ti, step] = exit_
+            current = exit_
+    return enter_min, exit_min
+
+
+def _parse_fixed_overrides(overrides: Dict[str, Any]) -> Dict[tuple, int]:
+    # Keyed by (train_id, section_id) with enter minutes already converted,
+    # so the scheduler never builds per-leg string keys or parses ISO strings
+    fixed: Dict[tuple, int] = {}
     try:
         for entry in overrides.get("fixed_enters", []):
-            key = f"{entry['train_id']}::{entry['section_id']}"
-            fixed[key] = datetime.fromisoformat(entry["enter_time"])  # ISO string
+            fixed[(entry["train_id"], entry["section_id"])] = _minutes_since_epoch(
+                datetime.fromisoformat(entry["enter_time"])  # ISO string
+            )
     except Exception:
         pass
     return fixed
 
 
-def generate_feasible_schedule(scenario: Scenario) -> Schedule:
-    # Index sections
-    sections_map: Dict[str, Section] = {s.id: s for s in get_domain_sections()}
+# What-if sessions re-optimize the same scenario many times with identical
+# overrides; memoize the parse keyed by the canonical JSON encoding
+_OVERRIDES_MEMO: Dict[bytes, Dict[tuple, int]] = {}
+_OVERRIDES_MEMO_MAX = 128
 
-    # Sort trains by priority (high first) then planned departure
-    trains_sorted = sorted(scenario.trains, key=lambda t: (-t.priority, t.planned_departure))
 
-    legs: List[ScheduleLeg] = []
-    # Maintain last exit time per (section) to enforce single-track headway
-    last_exit: Dict[str, datetime] = {}
+def parse_fixed_overrides(overrides: Dict[str, Any]) -> Dict[tuple, int]:
+    try:
+        key = orjson.dumps(overrides, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return _parse_fixed_overrides(overrides)
+    cached = _OVERRIDES_MEMO.get(key)
+    if cached is None:
+        if len(_OVERRIDES_MEMO) >= _OVERRIDES_MEMO_MAX:
+            _OVERRIDES_MEMO.clear()
+        cached = _OVERRIDES_MEMO[key] = _parse_fixed_overrides(overrides)
+    return cached
+
+
+# Lightweight mutable leg used while the schedule is still being shaped;
+# times stay as int minutes since epoch until materialization so the resolve
+# passes compare and shift plain integers instead of timedelta objects
+@dataclass(slots=True)
+class _Leg:
+    train_id: str
+    section_id: str
+    enter_min: int
+    exit_min: int
+
+
+def _has_overlap(enter: np.ndarray, exit_: np.ndarray) -> bool:
+    """Broadcast quick-reject: do any two occupancy intervals come within
+    the safety headway of each other?
+
+    Builds the pairwise conflict matrix in one vectorized expression so
+    conflict-free sections (the common case on later resolve passes) skip
+    the event sort entirely. Pads exits by SAFE_HEADWAY_MIN so the check is
+    conservative: it only skips work the full resolve pass would not do.
+    """
+    conflict = (enter[:, None] < exit_[None, :] + SAFE_HEADWAY_MIN) & (
+        enter[None, :] < exit_[:, None] + SAFE_HEADWAY_MIN
+    )
+    np.fill_diagonal(conflict, False)
+    return bool(conflict.any())
+
+
+def resolve_cliques(
+    section_id: str,
+    intervals: List[int],
+    legs: List[_Leg],
+    train_legs: Dict[str, List[int]],
+    priorities: Dict[str, int],
+    fixed_leg_idxs: set,
+) -> bool:
+    """Sweep-line over occupancy intervals of one section.
+
+    Detects all sets of mutually overlapping trains in O(n log n) and
+    serializes each set by priority, pushing later trains forward by the
+    safety headway. Returns True if any leg was moved.
+    """
+    events = []
+    for leg_idx in intervals:
+        leg = legs[leg_idx]
+        events.append((leg.enter_min, leg_idx, False))
+        # Extend occupancy by the headway so legs that merely come within the
+        # separation buffer join the conflict set, not just true overlaps
+        events.append((leg.exit_min + SAFE_HEADWAY_MIN, leg_idx, True))
+    events.sort(key=lambda x: (x[0], x[2]))
+
+    # Collect overlap-connected conflict sets in one pass
+    cliques: List[List[int]] = []
+    open_count = 0
+    component: List[int] = []
+    for _t, leg_idx, is_exit in events:
+        if is_exit:
+            open_count -= 1
+            if open_count == 0:
+                if len(component) > 1:
+                    cliques.append(component)
+                component = []
+        else:
+            open_count += 1
+            component.append(leg_idx)
+
+    moved = False
+    for clique in cliques:
+        ordered = sorted(clique, key=lambda i: (-priorities[legs[i].train_id], legs[i].enter_min))
+        prev_exit: Optional[int] = None
+        for leg_idx in ordered:
+            leg = legs[leg_idx]
+            if prev_exit is not None:
+                min_enter = prev_exit + SAFE_HEADWAY_MIN
+                if leg.enter_min < min_enter:
+                    # Shift this leg and the rest of the train's route forward
+                    delta = min_enter - leg.enter_min
+                    idxs = train_legs[leg.train_id]
+                    for i in idxs[idxs.index(leg_idx):]:
+                        if i != leg_idx and i in fixed_leg_idxs:
+                            break  # controller-fixed enter times stay pinned
+                        legs[i].enter_min += delta
+                        legs[i].exit_min += delta
+                    moved = True
+            prev_exit = leg.exit_min
+    return moved
 
-    fixed_enters = parse_fixed_overrides(scenario.overrides or {})
 
-    for tr in trains_sorted:
-        current_time = tr.planned_departure
-        for sec_id in tr.route:
-            sec = sections_map.get(sec_id)
-            if not sec:
-                raise HTTPException(400, f"Unknown section {sec_id}")
+def generate_feasible_schedule(scenario: Scenario) -> Schedule:
+    # Index sections
+    sections = get_domain_sections()
+    sections_map: Dict[str, Section] = {s.id: s for s in sections}
 
-            run_min = compute_run_time_minutes(sec, tr)
+    # Sort trains by priority (high first) then planned departure using
+    # precomputed key arrays instead of a per-comparison lambda
+    prio_arr = np.array([t.priority for t in scenario.trains], dtype=np.int64)
+    dep_arr = np.array([_minutes_since_epoch(t.planned_departure) for t in scenario.trains], dtype=np.int64)
+    order = np.lexsort((dep_arr, -prio_arr))
+    trains_sorted = [scenario.trains[i] for i in order]
 
-            # Consider fixed override for enter_time
-            key = f"{tr.id}::{sec_id}"
-            enter_time = fixed_enters.get(key, current_time)
+    fixed_enters = parse_fixed_overrides(scenario.overrides or {})
 
-            # Enforce headway on single track
-            if sec.single_track:
-                prev_exit = last_exit.get(sec_id)
-                if prev_exit and enter_time < prev_exit + timedelta(minutes=SAFE_HEADWAY_MIN):
-                    enter_time = prev_exit + timedelta(minutes=SAFE_HEADWAY_MIN)
+    # Structure-of-arrays section and train data for the JIT core
+    sec_index = {s.id: i for i, s in enumerate(sections)}
+    section_len = np.array([s.length_km for s in sections], dtype=np.float64)
+    section_spd = np.array([s.max_speed_kmh for s in sections], dtype=np.float64)
+    # Falsy (None or 0) means "no cap": the kernel takes the section limit directly
+    train_speed = np.array(
+        [t.max_speed_kmh if t.max_speed_kmh else 0.0 for t in trains_sorted], dtype=np.float64
+    )
+    train_capped = np.array([bool(t.max_speed_kmh) for t in trains_sorted], dtype=np.bool_)
+    max_route = max((len(t.route) for t in trains_sorted), default=0)
+    route_idx = np.zeros((len(trains_sorted), max_route), dtype=np.int64)
+    for ti, tr in enumerate(trains_sorted):
+        for step, sec_id in enumerate(tr.route):
+            # Known sections are the overwhelmingly common case; try/except
+            # skips the None sentinel check that .get() would cost per leg
+            try:
+                route_idx[ti, step] = sec_index[sec_id]
+            except KeyError:
+                raise HTTPException(400, f"Unknown section {sec_id}")
 
-            exit_time = enter_time + timedelta(minutes=run_min)
+    # First pass: roll each train over its route ignoring other traffic.
+    # The loop runs in the JIT core on int64 minutes; datetimes reappear only
+    # when the legs are materialized.
+    route_len = np.array([len(t.route) for t in trains_sorted], dtype=np.int64)
+    train_dep_min = dep_arr[order]
+    fixed_enter = np.full((len(trains_sorted), max_route), -1, dtype=np.int64)
+    if fixed_enters:
+        train_index = {t.id: ti for ti, t in enumerate(trains_sorted)}
+        for (train_id, sec_id), enter_m in fixed_enters.items():
+            ti = train_index.get(train_id)
+            if ti is None:
+                continue
+            for step, route_sec in enumerate(trains_sorted[ti].route):
+                if route_sec == sec_id:
+                    fixed_enter[ti, step] = enter_m
+    enter_min, exit_min = _schedule_core(
+        route_idx, route_len, section_len, section_spd, train_speed, train_capped, train_dep_min, fixed_enter
+    )
 
-            legs.append(ScheduleLeg(train_id=tr.id, section_id=sec_id, enter_time=enter_time, exit_time=exit_time))
-            last_exit[sec_id] = exit_time
-            current_time = exit_time
+    legs: List[_Leg] = []
+    train_legs: Dict[str, List[int]] = {}  # train id -> leg indices in route order
+    priorities: Dict[str, int] = {t.id: t.priority for t in scenario.trains}
+    fixed_leg_idxs: set = set()
+    for ti, tr in enumerate(trains_sorted):
+        idxs: List[int] = []
+        for step, sec_id in enumerate(tr.route):
+            if fixed_enter[ti, step] >= 0:
+                fixed_leg_idxs.add(len(legs))
+            idxs.append(len(legs))
+            legs.append(_Leg(
+                train_id=tr.id,
+                section_id=sec_id,
+                enter_min=int(enter_min[ti, step]),
+                exit_min=int(exit_min[ti, step]),
+            ))
+        train_legs[tr.id] = idxs
+
+    # Second pass: detect conflict sets per single-track section and serialize
+    # them by priority. Shifting a train can create new overlaps downstream,
+    # so iterate until a fixed point (bounded by the number of legs).
+    for _ in range(max(1, len(legs))):
+        moved = False
+        for sec_id, sec in sections_map.items():
+            if not sec.single_track:
+                continue
+            intervals = [i for i, l in enumerate(legs) if l.section_id == sec_id]
+            if len(intervals) < 2:
+                continue
+            enter_arr = np.array([legs[i].enter_min for i in intervals], dtype=np.int64)
+            exit_arr = np.array([legs[i].exit_min for i in intervals], dtype=np.int64)
+            if not _has_overlap(enter_arr, exit_arr):
+                continue
+            if resolve_cliques(sec_id, intervals, legs, train_legs, priorities, fixed_leg_idxs):
+                moved = True
+        if not moved:
+            break
 
     # Compute basic KPIs
     total_delay = 0.0
     # Throughput approximation: number of trains that reached their final section
-    last_sections = {t.id: (t.route[-1] if t.route else None) for t in scenario.trains}
-    finished_trains = set(
-        l.train_id for l in legs if last_sections.get(l.train_id) == l.section_id
-    )
-    throughput = len(finished_trains)
+    train_pos = {t.id: ti for ti, t in enumerate(trains_sorted)}
+    final_sec = [t.route[-1] if t.route else None for t in trains_sorted]
+    finished_counts: Dict[int, int] = {}
+    for l in legs:
+        ti = train_pos[l.train_id]
+        if final_sec[ti] == l.section_id:
+            finished_counts[ti] = finished_counts.get(ti, 0) + 1
+    throughput = len(finished_counts)
     objective = {"total_delay_min": total_delay, "throughput": throughput}
-    return Schedule(scenario_id=scenario.id, legs=legs, objective=objective)
+    # model_construct skips validation: the legs were built from validated
+    # inputs and integer arithmetic, so revalidating each row is wasted work
+    schedule_legs = [
+        ScheduleLeg.model_construct(
+            train_id=l.train_id,
+            section_id=l.section_id,
+            enter_time=_minutes_to_datetime(l.enter_min),
+            exit_time=_minutes_to_datetime(l.exit_min),
+        )
+        for l in legs
+    ]
+    return Schedule(scenario_id=scenario.id, legs=schedule_legs, objective=objective)
+
+
+# Sections are read-mostly: cache the decoded objects per process and only
+# hit Mongo when the cache is cold, expired, or explicitly invalidated.
+SECTIONS_CACHE_TTL_SEC = 60
+_SECTIONS_CACHE: Optional[List[Section]] = None
+_SECTIONS_TS: float = 0.0
+
+
+def invalidate_sections_cache() -> None:
+    """Drop the cached sections; call after any section create/update."""
+    global _SECTIONS_CACHE, _SECTIONS_TS
+    _SECTIONS_CACHE = None
+    _SECTIONS_TS = 0.0
 
 
 def get_domain_sections() -> List[Section]:
-    # Fetch from DB; if empty, seed defaults
-    existing = get_documents("section", {}) if db else []
+    global _SECTIONS_CACHE, _SECTIONS_TS
+    now = time.monotonic()
+    if _SECTIONS_CACHE is not None and now - _SECTIONS_TS < SECTIONS_CACHE_TTL_SEC:
+        return _SECTIONS_CACHE
+    sections = _load_domain_sections()
+    _SECTIONS_CACHE = sections
+    _SECTIONS_TS = now
+    return sections
+
+
+# model_fields.keys() walks pydantic internals; snapshot the field names once
+_SECTION_FIELDS = tuple(Section.model_fields)
+
+_section_index_ensured = False
+
+
+def _ensure_section_index() -> None:
+    # One-time, best-effort: lets the section scan walk an index and keeps
+    # reads cheap once the collection grows beyond the seed data
+    global _section_index_ensured
+    if _section_index_ensured or db is None:
+        return
+    try:
+        db["section"].create_index("id")
+    except Exception:
+        pass
+    _section_index_ensured = True
+
+
+def _load_domain_sections() -> List[Section]:
+    # Fetch from DB; if empty, seed defaults. Project _id away: it is never
+    # used and skipping it trims every document on the wire
+    _ensure_section_index()
+    existing = get_documents("section", {}, projection={"_id": 0}) if db else []
     if not existing:
         defaults = [
             Section(id="S1", name="Alpha-Loop", length_km=10.0, single_track=True, max_speed_kmh=110, crossing_loops=["A"]),
@@ -123,7 +488,7 @@ def get_domain_sections() -> List[Section]:
         for d in existing:
             try:
                 # Normalize dict from Mongo into Section
-                payload = {k: d.get(k) for k in Section.model_fields.keys()}
+                payload = {k: d.get(k) for k in _SECTION_FIELDS}
                 res.append(Section(**payload))
             except Exception:
                 continue
@@ -135,18 +500,17 @@ def list_sections():
     return get_domain_sections()
 
 
-@app.post("/api/optimize", response_model=OptimizeResponse)
+# response_model=None: the schedule was just built from validated inputs, so
+# skip FastAPI's second round of validation and encode straight to bytes
+@app.post("/api/optimize", response_model=None)
 def optimize(req: OptimizeRequest):
     sched = generate_feasible_schedule(req.scenario)
     explanation = (
         "Generated a conflict-minimized timetable using priority-first sequencing, safety headways, and controller overrides where provided."
     )
     # Audit
-    try:
-        create_document("auditevent", AuditEvent(action="optimize", payload={"scenario_id": req.scenario.id or "ad-hoc"}))
-    except Exception:
-        pass
-    return OptimizeResponse(schedule=sched, explanation=explanation)
+    log_audit_event(AuditEvent(action="optimize", payload={"scenario_id": req.scenario.id or "ad-hoc"}))
+    return Response(content=_encode_optimize_response(sched, explanation), media_type="application/json")
 
 
 # What-if simulation: tweak a scenario (e.g., delay a train) and re-optimize
@@ -156,7 +520,7 @@ class WhatIfRequest(BaseModel):
     delay_minutes: int = 0
 
 
-@app.post("/api/whatif", response_model=OptimizeResponse)
+@app.post("/api/whatif", response_model=None)
 def what_if(req: WhatIfRequest):
     sc = req.scenario
     if req.delay_train_id and req.delay_minutes:
@@ -165,29 +529,45 @@ def what_if(req: WhatIfRequest):
                 t.planned_departure = t.planned_departure + timedelta(minutes=req.delay_minutes)
                 break
     sched = generate_feasible_schedule(sc)
-    try:
-        create_document("auditevent", AuditEvent(action="what_if", payload={"train": req.delay_train_id, "delay": req.delay_minutes}))
-    except Exception:
-        pass
-    return OptimizeResponse(schedule=sched, explanation="Scenario re-optimized with applied delay.")
+    log_audit_event(AuditEvent(action="what_if", payload={"train": req.delay_train_id, "delay": req.delay_minutes}))
+    return Response(
+        content=_encode_optimize_response(sched, "Scenario re-optimized with applied delay."),
+        media_type="application/json",
+    )
 
 
 # KPIs endpoint (mock aggregation over latest schedule records)
 @app.get("/api/kpis", response_model=KPIReport)
 def kpis():
-    now = datetime.utcnow()
+    # One time.time() call and C-level strftime instead of building datetime
+    # objects and timedeltas per request
+    now_s = int(time.time())
+    iso = "%Y-%m-%dT%H:%M:%S"
     report = KPIReport(
-        time_range={"from": (now - timedelta(hours=1)).isoformat(), "to": now.isoformat()},
+        time_range={"from": time.strftime(iso, time.gmtime(now_s - 3600)), "to": time.strftime(iso, time.gmtime(now_s))},
         punctuality=0.95,
         avg_delay_min=3.2,
         throughput_trains=24,
         section_utilization={"S1": 0.7, "S2": 0.8, "S3": 0.65},
     )
+    log_audit_event(AuditEvent(action="kpi_view"))
+    return report
+
+
+_audit_index_ensured = False
+
+
+def _ensure_audit_index() -> None:
+    # One-time, best-effort: the pushed-down sort needs a timestamp index or
+    # Mongo still scans the whole collection for the top-k
+    global _audit_index_ensured
+    if _audit_index_ensured or db is None:
+        return
     try:
-        create_document("auditevent", AuditEvent(action="kpi_view"))
+        db["auditevent"].create_index([("timestamp", -1)])
     except Exception:
         pass
-    return report
+    _audit_index_ensured = True
 
 
 @app.get("/api/audit")
@@ -195,11 +575,10 @@ def audit_log(limit: int = 50):
     try:
         if db is None:
             return {"items": []}
-        items = get_documents("auditevent", {})
-        # Sort by timestamp desc if present
-        def _ts(i):
-            return i.get("timestamp") or i.get("created_at") or datetime.utcnow()
-        items_sorted = sorted(items, key=_ts, reverse=True)[:limit]
+        # Sort + limit on the server so Mongo walks its index instead of
+        # shipping the whole collection for a Python sort
+        _ensure_audit_index()
+        items_sorted = get_documents("auditevent", {}, limit=limit, sort=[("timestamp", -1)])
         # Convert ObjectId to str if present
         for it in items_sorted:
             if "_id" in it: